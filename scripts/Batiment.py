@@ -1,7 +1,11 @@
 """
 Class representing a building in the electrical grid network.
+Also provides a columnar table (BatimentTable) for batched computations.
 """
 
+import numpy as np
+
+
 class Batiment:
     """
     Represents a building that needs to be connected to the electrical grid.
@@ -17,6 +21,9 @@ class Batiment:
         priority_score (float): Calculated priority score for connection
     """
     
+    __slots__ = ('id_batiment', 'type_batiment', 'nb_maisons', 'geometry', 'connected',
+                 'connection_cost', 'connection_time', 'priority_score', 'connected_via')
+    
     # Priority weights for different building types
     TYPE_PRIORITIES = {
         'hôpital': 100,    # Hospitals have highest priority
@@ -89,3 +96,130 @@ class Batiment:
     def __str__(self):
         status = "Connected" if self.connected else "Not connected"
         return f"{self.id_batiment} ({self.type_batiment}): {self.nb_maisons} maisons - {status}"
+
+
+# Integer codes for building types in BatimentTable (0 = unknown type)
+TYPE_CODES = {
+    'habitation': 1,
+    'école': 2,
+    'hôpital': 3
+}
+
+# Priority weight per type code, same weights as Batiment.TYPE_PRIORITIES
+PRIORITY_LUT = np.array(
+    [1] + [Batiment.TYPE_PRIORITIES[t] for t in sorted(TYPE_CODES, key=TYPE_CODES.get)],
+    dtype=np.int32
+)
+
+
+def encode_types(types):
+    """
+    Encode building types as integer codes (see TYPE_CODES).
+    
+    Args:
+        types: Sequence of building type names
+    
+    Returns:
+        np.ndarray: int8 type codes
+    """
+    types = np.asarray(types, dtype=object)
+    # Only the distinct type names go through the dict lookup
+    uniques, inverse = np.unique(types, return_inverse=True)
+    codes = np.array([TYPE_CODES.get(t, 0) for t in uniques], dtype=np.int8)
+    return codes[inverse.reshape(-1)]
+
+
+def compute_priorities(type_code, nb_maisons):
+    """
+    Calculate priority scores for many buildings at once.
+    Same rule as Batiment.calculate_priority: type weight * number of houses.
+    
+    Args:
+        type_code (np.ndarray): Encoded building types
+        nb_maisons (np.ndarray): Number of houses per building
+    
+    Returns:
+        np.ndarray: Priority scores
+    """
+    return PRIORITY_LUT[type_code] * nb_maisons
+
+
+def compute_efficiencies(nb_maisons, connection_cost):
+    """
+    Calculate efficiency scores (houses per euro) for many buildings at once.
+    Same rule as Batiment.get_efficiency_score: 0 when the cost is not positive.
+    
+    Args:
+        nb_maisons (np.ndarray): Number of houses per building
+        connection_cost (np.ndarray): Connection cost per building
+    
+    Returns:
+        np.ndarray: Efficiency scores
+    """
+    connection_cost = np.asarray(connection_cost, dtype=np.float64)
+    return np.divide(nb_maisons, connection_cost,
+                     out=np.zeros(connection_cost.shape), where=connection_cost > 0)
+
+
+class BatimentTable:
+    """
+    Columnar storage for a set of buildings (one array per attribute).
+    
+    Attributes:
+        id (np.ndarray[object]): Building IDs
+        type_batiment (np.ndarray[object]): Building types
+        type_code (np.ndarray[int8]): Encoded building types
+        nb (np.ndarray[int32]): Number of houses per building
+        geometry (np.ndarray[object]): Shapefile geometries (None if missing)
+        cost (np.ndarray[float64]): Connection cost per building
+        time (np.ndarray[float64]): Connection time per building
+        connected_via (np.ndarray[int64]): Index of the infrastructure used (-1 if none)
+        connected (np.ndarray[bool]): Whether each building is connected
+        priority_score (np.ndarray[int32]): Priority score per building
+    """
+    
+    def __init__(self, ids, types, nb_maisons, geometry=None):
+        """
+        Initialize a building table.
+        
+        Args:
+            ids: Building IDs
+            types: Building types
+            nb_maisons: Number of houses per building
+            geometry: Shapefile geometries (optional)
+        """
+        self.id = np.asarray(ids, dtype=object)
+        self.type_batiment = np.asarray(types, dtype=object)
+        self.type_code = encode_types(self.type_batiment)
+        self.nb = np.asarray(nb_maisons, dtype=np.int32)
+        if geometry is None:
+            self.geometry = np.full(len(self.id), None, dtype=object)
+        else:
+            self.geometry = np.asarray(geometry, dtype=object)
+        self.cost = np.zeros(len(self.id))
+        self.time = np.zeros(len(self.id))
+        self.connected_via = np.full(len(self.id), -1, dtype=np.int64)
+        self.connected = np.zeros(len(self.id), dtype=bool)
+        self.priority_score = compute_priorities(self.type_code, self.nb)
+    
+    def get_efficiency_scores(self):
+        """
+        Calculate efficiency scores (houses per euro) for all buildings.
+        
+        Returns:
+            np.ndarray: Efficiency scores
+        """
+        return compute_efficiencies(self.nb, self.cost)
+    
+    def __len__(self):
+        return len(self.id)
+    
+    def __getitem__(self, i):
+        """Return building i as a Batiment object (for legacy code paths)."""
+        b = Batiment(self.id[i], self.type_batiment[i], self.nb[i], self.geometry[i])
+        b.connection_cost = float(self.cost[i])
+        b.connection_time = float(self.time[i])
+        b.connected_via = int(self.connected_via[i]) if self.connected_via[i] >= 0 else None
+        b.connected = bool(self.connected[i])
+        b.priority_score = float(self.priority_score[i])
+        return b
@@ -1,7 +1,12 @@
 """
 Class representing electrical infrastructure (power lines).
+Also provides a columnar table (InfrastructureTable) for batched computations.
 """
 
+import numpy as np
+import shapely
+
+
 class Infrastructure:
     """
     Represents an electrical infrastructure line.
@@ -17,6 +22,9 @@ class Infrastructure:
         shared (bool): Whether this line is shared by multiple buildings
     """
     
+    __slots__ = ('id_infra', 'type_infra', 'geometry', 'length', 'cost_per_meter',
+                 'time_per_meter', 'buildings_connected', '_connected_set', 'shared')
+    
     # Cost and time data for different infrastructure types
     INFRASTRUCTURE_SPECS = {
         'aerien': {'cost': 500, 'time': 2},           # €/m, h/m
@@ -38,6 +46,7 @@ class Infrastructure:
         self.geometry = geometry
         self.length = 0.0
         self.buildings_connected = []
+        self._connected_set = set()  # same IDs, for O(1) membership checks
         self.shared = False
         
         # Set cost and time based on type
@@ -45,6 +54,21 @@ class Infrastructure:
         self.cost_per_meter = specs['cost']
         self.time_per_meter = specs['time']
     
+    @classmethod
+    def from_arrays(cls, ids, types, lengths):
+        """
+        Build a columnar table for many infrastructures at once.
+        
+        Args:
+            ids: Infrastructure IDs
+            types: Infrastructure types
+            lengths: Line lengths in meters
+        
+        Returns:
+            InfrastructureTable: Table with costs computed for all lines
+        """
+        return InfrastructureTable(ids, types, lengths)
+    
     def calculate_length(self):
         """
         Calculate the length of the infrastructure line from geometry.
@@ -81,7 +105,8 @@ class Infrastructure:
         Args:
             building_id (str): Building ID to add
         """
-        if building_id not in self.buildings_connected:
+        if building_id not in self._connected_set:
+            self._connected_set.add(building_id)
             self.buildings_connected.append(building_id)
             if len(self.buildings_connected) > 1:
                 self.shared = True
@@ -113,3 +138,123 @@ class Infrastructure:
     def __str__(self):
         shared_info = f" (shared by {len(self.buildings_connected)} buildings)" if self.shared else ""
         return f"{self.id_infra} ({self.type_infra}): {self.length:.2f}m - {self.get_total_cost():.2f}€{shared_info}"
+
+
+# Integer codes for infrastructure types in InfrastructureTable
+TYPE_INDEX = {t: i for i, t in enumerate(Infrastructure.INFRASTRUCTURE_SPECS)}
+UNKNOWN_TYPE = len(TYPE_INDEX)  # unknown types cost nothing, as in Infrastructure
+
+# Cost (€/m) and time (h/m) per type code, last entry for unknown types
+COST_LUT = np.array(
+    [spec['cost'] for spec in Infrastructure.INFRASTRUCTURE_SPECS.values()] + [0],
+    dtype=np.float32
+)
+TIME_LUT = np.array(
+    [spec['time'] for spec in Infrastructure.INFRASTRUCTURE_SPECS.values()] + [0],
+    dtype=np.float32
+)
+
+
+def encode_types(types):
+    """
+    Encode infrastructure types as integer codes (see TYPE_INDEX).
+    
+    Args:
+        types: Sequence of infrastructure type names
+    
+    Returns:
+        np.ndarray: int8 type codes
+    """
+    types = np.asarray(types, dtype=object)
+    # Only the distinct type names go through the dict lookup
+    uniques, inverse = np.unique(types, return_inverse=True)
+    codes = np.array([TYPE_INDEX.get(t, UNKNOWN_TYPE) for t in uniques], dtype=np.int8)
+    return codes[inverse.reshape(-1)]
+
+
+def compute_lengths(geometries):
+    """
+    Calculate the length of many infrastructure lines in one vectorized call.
+    Missing geometries get a length of 0, as in Infrastructure.calculate_length.
+    
+    Args:
+        geometries: GeoSeries or array of line geometries
+    
+    Returns:
+        np.ndarray: Lengths in meters
+    """
+    return np.nan_to_num(shapely.length(np.asarray(geometries, dtype=object)), nan=0.0)
+
+
+class InfrastructureTable:
+    """
+    Columnar storage for a set of infrastructure lines (one array per attribute).
+    
+    Attributes:
+        id (np.ndarray[object]): Infrastructure IDs
+        type_infra (np.ndarray[object]): Infrastructure types
+        type_code (np.ndarray[int8]): Encoded infrastructure types
+        geometry (np.ndarray[object]): Shapefile geometries (None if missing)
+        length (np.ndarray[float64]): Line lengths in meters
+        cost_per_meter (np.ndarray[float32]): Cost per meter based on type
+        time_per_meter (np.ndarray[float32]): Installation time per meter
+        total_cost (np.ndarray[float64]): Total cost per line in euros
+        total_time (np.ndarray[float64]): Total installation time per line in hours
+        n_buildings (np.ndarray[int64]): Number of buildings connected via each line
+    """
+    
+    def __init__(self, ids, types, lengths=None, geometry=None):
+        """
+        Initialize an infrastructure table.
+        
+        Args:
+            ids: Infrastructure IDs
+            types: Infrastructure types
+            lengths: Line lengths in meters (optional, measured from geometry if omitted)
+            geometry: Shapefile geometries (optional)
+        """
+        self.id = np.asarray(ids, dtype=object)
+        self.type_infra = np.asarray(types, dtype=object)
+        self.type_code = encode_types(self.type_infra)
+        if geometry is None:
+            self.geometry = np.full(len(self.id), None, dtype=object)
+        else:
+            self.geometry = np.asarray(geometry, dtype=object)
+        self.cost_per_meter = COST_LUT[self.type_code]
+        self.time_per_meter = TIME_LUT[self.type_code]
+        self.set_lengths(compute_lengths(self.geometry) if lengths is None else lengths)
+        self.n_buildings = np.zeros(len(self.id), dtype=np.int64)
+    
+    def set_lengths(self, lengths):
+        """
+        Set line lengths and update total costs and times.
+        
+        Args:
+            lengths: Line lengths in meters
+        """
+        self.length = np.asarray(lengths, dtype=np.float64)
+        self.total_cost = self.length * self.cost_per_meter
+        self.total_time = self.length * self.time_per_meter
+    
+    def add_buildings(self, infra_indices):
+        """
+        Record one connected building per entry (each building added once).
+        
+        Args:
+            infra_indices: Index of the line used by each newly connected building
+        """
+        np.add.at(self.n_buildings, infra_indices, 1)
+    
+    @property
+    def shared(self):
+        """np.ndarray[bool]: Whether each line is shared by multiple buildings"""
+        return self.n_buildings > 1
+    
+    def __len__(self):
+        return len(self.id)
+    
+    def __getitem__(self, i):
+        """Return line i as an Infrastructure object (for legacy code paths)."""
+        infra = Infrastructure(self.id[i], self.type_infra[i], self.geometry[i])
+        infra.length = float(self.length[i])
+        return infra
@@ -5,13 +5,27 @@ Analyzes building connections to optimize cost and maximize connections
 
 import pandas as pd
 import numpy as np
-from collections import defaultdict
+from collections import namedtuple
+from numba import njit, prange
 import json
+import os
+import sys
 
 def load_network_data(filepath='reseau_en_arbre.xlsx'):
-    """Load the network tree data from Excel file"""
+    """
+    Load the network tree data from Excel file
+    A Parquet copy is cached next to the file and reused while it is up to date.
+    """
     try:
-        df = pd.read_excel(filepath)
+        cache = os.fspath(filepath) + '.parquet'
+        if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(filepath):
+            df = pd.read_parquet(cache)
+        else:
+            df = pd.read_excel(filepath, engine='calamine')
+            try:
+                df.to_parquet(cache)
+            except Exception as e:
+                print(f"⚠ Could not cache network data: {e}")
         print(f"✓ Loaded {len(df)} connections from network data")
         print(f"Columns: {list(df.columns)}")
         return df
@@ -19,36 +33,85 @@ def load_network_data(filepath='reseau_en_arbre.xlsx'):
         print(f"Error loading data: {e}")
         return None
 
+class NetworkGraph(namedtuple('NetworkGraph', ['nodes', 'indptr', 'neighbor', 'edge_cost', 'edge_conn'])):
+    """
+    Network adjacency in compressed sparse row (CSR) layout.
+    Node labels are remapped to dense ids (positions in `nodes`); the edges leaving
+    node u are neighbor/edge_cost/edge_conn[indptr[u]:indptr[u + 1]].
+    """
+    __slots__ = ()
+    
+    def neighbors(self, u):
+        """Dense ids of the nodes reachable from node u"""
+        return self.neighbor[self.indptr[u]:self.indptr[u + 1]]
+
+def _resolve_column(df, *candidates):
+    """Return the first candidate column present in df, or None"""
+    return next((c for c in candidates if c in df.columns), None)
+
 def build_graph(df):
     """
     Build a graph representation of the network
-    Returns: dict with node connections and costs
+    Returns: CSR adjacency (NetworkGraph) and dict with connection costs
+    (each entry also holds the dense source/target node ids)
     """
-    graph = defaultdict(list)
     costs = {}
     
     # Assuming columns like: source, target, cost, nb_prises (number of connections)
-    for idx, row in df.iterrows():
-        # Adapt column names based on actual data structure
-        source = row.get('source', row.get('from', idx))
-        target = row.get('target', row.get('to', idx + 1))
-        cost = row.get('cost', row.get('cout', 0))
-        nb_connections = row.get('nb_prises', row.get('prises', 1))
-        
-        # Build bidirectional graph
-        graph[source].append({
-            'target': target,
-            'cost': cost,
-            'connections': nb_connections
-        })
-        
+    # Adapt column names based on actual data structure (resolved once, not per row)
+    source_col = _resolve_column(df, 'source', 'from')
+    target_col = _resolve_column(df, 'target', 'to')
+    cost_col = _resolve_column(df, 'cost', 'cout')
+    connections_col = _resolve_column(df, 'nb_prises', 'prises')
+    
+    index = df.index.to_numpy()
+    sources = df[source_col].to_numpy() if source_col else index
+    targets = df[target_col].to_numpy() if target_col else index + 1
+    cost_values = df[cost_col].to_numpy() if cost_col else np.zeros(len(df))
+    nb_values = df[connections_col].to_numpy() if connections_col else np.ones(len(df), dtype=int)
+    
+    # Remap node labels to dense integer ids, in order of first appearance
+    # (hash based: labels may mix types or hold NaN for blank cells, so no sorting)
+    node_ids, nodes = pd.factorize(np.concatenate([sources, targets]), use_na_sentinel=False)
+    source_ids = node_ids[:len(df)]
+    target_ids = node_ids[len(df):]
+    
+    # Group edges by source node: edges of node u live in [indptr[u], indptr[u + 1])
+    order = np.argsort(source_ids, kind='stable')
+    indptr = np.searchsorted(source_ids[order], np.arange(len(nodes) + 1))
+    graph = NetworkGraph(
+        nodes=nodes,
+        indptr=indptr,
+        neighbor=target_ids[order].astype(np.int32),
+        edge_cost=cost_values[order].astype(np.float64),
+        edge_conn=nb_values[order].astype(np.float64)
+    )
+    
+    # .tolist() converts to native Python scalars in one pass (no per-row Series)
+    for source, target, cost, nb_connections, source_id, target_id in zip(
+            sources.tolist(), targets.tolist(), cost_values.tolist(), nb_values.tolist(),
+            source_ids.tolist(), target_ids.tolist()):
         costs[(source, target)] = {
             'cost': cost,
-            'connections': nb_connections
+            'connections': nb_connections,
+            'source_id': source_id,
+            'target_id': target_id
         }
     
     return graph, costs
 
+@njit(parallel=True, cache=True)
+def _priority_kernel(cost, nb_connections, shared_lines):
+    """Element-wise priority metric over 1-D float64 arrays"""
+    priority = np.empty(cost.size)
+    for i in prange(cost.size):
+        c = cost[i]
+        if c == 0.0:
+            priority[i] = np.inf
+        else:
+            priority[i] = (nb_connections[i] / c) * (1.0 + 0.2 * shared_lines[i])
+    return priority
+
 def calculate_priority_metric(cost, nb_connections, shared_lines=0):
     """
     Calculate priority metric for building connection
@@ -56,47 +119,49 @@ def calculate_priority_metric(cost, nb_connections, shared_lines=0):
     Priority = (Number of connections / Cost) * (1 + Sharing bonus)
     
     Higher value = Higher priority (more connections per euro, with bonus for sharing)
+    Sharing bonus is 20% per shared line. Accepts scalars or NumPy arrays
+    (computed element-wise by a compiled kernel); returns a float when every
+    input is a scalar.
     """
-    if cost == 0:
-        return float('inf')
-    
-    # Base metric: connections per unit cost
-    base_metric = nb_connections / cost
-    
-    # Bonus for line sharing (reduces effective cost)
-    sharing_bonus = 0.2 * shared_lines  # 20% bonus per shared line
-    
-    priority = base_metric * (1 + sharing_bonus)
-    
-    return priority
+    cost, nb_connections, shared_lines = np.broadcast_arrays(
+        np.asarray(cost, dtype=np.float64),
+        np.asarray(nb_connections, dtype=np.float64),
+        np.asarray(shared_lines, dtype=np.float64)
+    )
+    priority = _priority_kernel(cost.ravel(), nb_connections.ravel(), shared_lines.ravel())
+    if cost.ndim == 0:
+        return float(priority[0])
+    return priority.reshape(cost.shape)
 
 def analyze_connections(graph, costs):
     """
     Analyze all connections and calculate priorities
+    Returns: NumPy record array sorted by priority (highest first)
     """
-    connection_analysis = []
+    pairs = list(costs.keys())
+    sources = np.fromiter((source for source, _ in pairs), dtype=object, count=len(pairs))
+    targets = np.fromiter((target for _, target in pairs), dtype=object, count=len(pairs))
+    cost_arr = np.asarray([info['cost'] for info in costs.values()])
+    conn_arr = np.asarray([info['connections'] for info in costs.values()])
     
-    for (source, target), info in costs.items():
-        cost = info['cost']
-        connections = info['connections']
-        
-        # Calculate priority metric
-        priority = calculate_priority_metric(cost, connections)
-        
-        # Calculate cost per connection
-        cost_per_connection = cost / connections if connections > 0 else float('inf')
-        
-        connection_analysis.append({
-            'source': source,
-            'target': target,
-            'cost': cost,
-            'connections': connections,
-            'cost_per_connection': cost_per_connection,
-            'priority_score': priority
-        })
+    # Calculate priority metric and cost per connection for all connections at once
+    priority = calculate_priority_metric(cost_arr, conn_arr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost_per_connection = np.where(conn_arr > 0, cost_arr / conn_arr, np.inf)
     
-    # Sort by priority (highest first)
-    connection_analysis.sort(key=lambda x: x['priority_score'], reverse=True)
+    # Dense node ids (positions in graph.nodes), as assigned by build_graph
+    source_ids = np.fromiter((info['source_id'] for info in costs.values()), dtype=np.int64, count=len(pairs))
+    target_ids = np.fromiter((info['target_id'] for info in costs.values()), dtype=np.int64, count=len(pairs))
+    
+    records = np.rec.fromarrays(
+        [sources, targets, cost_arr, conn_arr, cost_per_connection, priority, source_ids, target_ids],
+        names=['source', 'target', 'cost', 'connections', 'cost_per_connection', 'priority_score',
+               'source_id', 'target_id']
+    )
+    
+    # Sort by priority (highest first); stable so ties keep input order
+    order = np.argsort(-priority, kind='stable')
+    connection_analysis = records[order]
     
     return connection_analysis
 
@@ -108,38 +173,54 @@ def create_connection_plan(connection_analysis, budget=None):
     1. Sort by priority score
     2. Select connections that maximize connections/cost ratio
     3. Consider line sharing opportunities
+    
+    connected_buildings is returned as an array of dense node ids (see NetworkGraph.nodes).
     """
-    plan = []
-    total_cost = 0
-    total_connections = 0
-    connected_buildings = set()
+    # Cumulative cost in priority order: the plan is the longest prefix within budget
+    if budget:
+        n_selected = int(np.searchsorted(np.cumsum(connection_analysis['cost']), budget, side='right'))
+    else:
+        n_selected = len(connection_analysis)
+    plan = connection_analysis[:n_selected]
+    
+    total_cost = plan['cost'].sum()
+    total_connections = plan['connections'].sum()
+    connected_buildings = np.unique(np.concatenate([plan['source_id'], plan['target_id']]))
     
+    print_connection_plan(plan)
+    if n_selected < len(connection_analysis):
+        print(f"\n⚠ Budget limit reached at connection #{n_selected + 1}")
+    
+    return plan, total_cost, total_connections, connected_buildings
+
+def print_connection_plan(plan):
+    """Print connection details for the plan, written to stdout in a single call"""
     print("\n" + "="*70)
     print("CONNECTION PLAN - Prioritized by Cost Efficiency")
     print("="*70)
     
-    for idx, conn in enumerate(connection_analysis, 1):
-        # Check budget constraint if specified
-        if budget and (total_cost + conn['cost']) > budget:
-            print(f"\n⚠ Budget limit reached at connection #{idx}")
-            break
-        
-        # Add to plan
-        plan.append(conn)
-        total_cost += conn['cost']
-        total_connections += conn['connections']
-        connected_buildings.add(conn['source'])
-        connected_buildings.add(conn['target'])
-        
-        # Print connection details
-        print(f"\n#{idx}. Connect {conn['source']} → {conn['target']}")
-        print(f"   Cost: €{conn['cost']:,.2f}")
-        print(f"   Connections: {conn['connections']}")
-        print(f"   Cost/Connection: €{conn['cost_per_connection']:,.2f}")
-        print(f"   Priority Score: {conn['priority_score']:.4f}")
-        print(f"   Running Total: €{total_cost:,.2f} | {total_connections} connections")
+    # Numbers are formatted in bulk (no thousands separators on per-connection lines)
+    costs = np.char.mod('%.2f', plan['cost'].astype(np.float64))
+    costs_per_connection = np.char.mod('%.2f', plan['cost_per_connection'])
+    priority_scores = np.char.mod('%.4f', plan['priority_score'])
+    running_costs = np.char.mod('%.2f', np.cumsum(plan['cost']).astype(np.float64))
+    running_connections = np.cumsum(plan['connections'])
     
-    return plan, total_cost, total_connections, connected_buildings
+    lines = [
+        f"\n#{idx}. Connect {source} → {target}\n"
+        f"   Cost: €{cost}\n"
+        f"   Connections: {connections}\n"
+        f"   Cost/Connection: €{cost_per_connection}\n"
+        f"   Priority Score: {score}\n"
+        f"   Running Total: €{running_cost} | {running_conn} connections"
+        for idx, source, target, cost, connections, cost_per_connection, score, running_cost, running_conn
+        in zip(range(1, len(plan) + 1), plan['source'].tolist(), plan['target'].tolist(),
+               costs.tolist(), plan['connections'].tolist(), costs_per_connection.tolist(),
+               priority_scores.tolist(), running_costs.tolist(), running_connections.tolist())
+    ]
+    
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def generate_summary_statistics(plan, total_cost, total_connections, connected_buildings):
     """Generate summary statistics for the connection plan"""
@@ -154,7 +235,7 @@ def generate_summary_statistics(plan, total_cost, total_connections, connected_b
     print(f"Average Connections per Building Link: {total_connections/len(plan):.2f}")
     
     # Calculate efficiency metrics
-    if plan:
+    if len(plan) > 0:
         best_connection = max(plan, key=lambda x: x['priority_score'])
         worst_connection = min(plan, key=lambda x: x['priority_score'])
         
@@ -174,41 +255,39 @@ def identify_sharing_opportunities(graph, plan):
     print("LINE SHARING OPPORTUNITIES")
     print("="*70)
     
-    # Track which nodes are connected
-    connected_nodes = set()
-    for conn in plan:
-        connected_nodes.add(conn['source'])
-        connected_nodes.add(conn['target'])
-    
-    # Find potential shared infrastructure
-    sharing_opportunities = []
-    node_connections = defaultdict(list)
-    
-    for conn in plan:
-        node_connections[conn['source']].append(conn)
-        node_connections[conn['target']].append(conn)
-    
-    # Nodes with multiple connections can share infrastructure
-    for node, connections in node_connections.items():
-        if len(connections) > 1:
-            total_shared_cost = sum(c['cost'] for c in connections)
-            total_shared_connections = sum(c['connections'] for c in connections)
-            sharing_opportunities.append({
-                'node': node,
-                'num_shared_lines': len(connections),
-                'total_cost': total_shared_cost,
-                'total_connections': total_shared_connections,
-                'potential_savings': total_shared_cost * 0.15  # Assume 15% savings from sharing
-            })
-    
-    if sharing_opportunities:
-        sharing_opportunities.sort(key=lambda x: x['potential_savings'], reverse=True)
-        print(f"\nFound {len(sharing_opportunities)} nodes with sharing potential:")
-        for opp in sharing_opportunities[:5]:  # Show top 5
-            print(f"\n  Node {opp['node']}:")
-            print(f"    Shared lines: {opp['num_shared_lines']}")
-            print(f"    Total connections: {opp['total_connections']}")
-            print(f"    Potential savings: €{opp['potential_savings']:,.2f}")
+    # Group plan connections by node (each connection counts for both endpoints)
+    n_nodes = len(graph.nodes)
+    node_ids = np.concatenate([plan['source_id'], plan['target_id']])
+    line_costs = np.concatenate([plan['cost'], plan['cost']]).astype(np.float64)
+    line_connections = np.concatenate([plan['connections'], plan['connections']]).astype(np.float64)
+    
+    num_shared_lines = np.bincount(node_ids, minlength=n_nodes)
+    total_shared_cost = np.bincount(node_ids, weights=line_costs, minlength=n_nodes)
+    total_shared_connections = np.bincount(node_ids, weights=line_connections, minlength=n_nodes)
+    
+    # Nodes with multiple connections can share infrastructure, listed in order of
+    # first appearance in the plan (source then target of each connection)
+    first_seen = np.full(n_nodes, len(node_ids))
+    np.minimum.at(first_seen, np.column_stack([plan['source_id'], plan['target_id']]).ravel(),
+                  np.arange(len(node_ids)))
+    sharing_nodes = np.flatnonzero(num_shared_lines > 1)
+    sharing_nodes = sharing_nodes[np.argsort(first_seen[sharing_nodes], kind='stable')]
+    potential_savings = total_shared_cost[sharing_nodes] * 0.15  # Assume 15% savings from sharing
+    
+    if sharing_nodes.size:
+        # Show top 5: partial selection of the 5th best savings, then a stable sort of
+        # every node at least that good so ties keep first-appearance order
+        n_top = min(5, sharing_nodes.size)
+        cutoff = -np.partition(-potential_savings, n_top - 1)[n_top - 1]
+        top = np.flatnonzero(potential_savings >= cutoff)
+        top = top[np.argsort(-potential_savings[top], kind='stable')][:n_top]
+        print(f"\nFound {sharing_nodes.size} nodes with sharing potential:")
+        for i in top:
+            node = sharing_nodes[i]
+            print(f"\n  Node {graph.nodes[node]}:")
+            print(f"    Shared lines: {num_shared_lines[node]}")
+            print(f"    Total connections: {total_shared_connections[node].astype(plan['connections'].dtype)}")
+            print(f"    Potential savings: €{potential_savings[i]:,.2f}")
     else:
         print("\nNo significant sharing opportunities identified in current plan.")
 
@@ -248,7 +327,7 @@ def main():
     # Export results
     print("\n" + "="*70)
     print("Exporting results...")
-    results_df = pd.DataFrame(plan)
+    results_df = pd.DataFrame(plan).drop(columns=['source_id', 'target_id'])
     results_df.to_csv('connection_plan.csv', index=False)
     print("✓ Results exported to 'connection_plan.csv'")
     
@@ -0,0 +1,52 @@
+<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>
+<qgis version="3.28.0">
+  <renderer-v2 type="categorizedSymbol" attr="type" forceraster="0">
+    <categories>
+      <category render="true" symbol="0" value="hôpital" label="Hospital (Critical)"/>
+      <category render="true" symbol="1" value="école" label="School (High Priority)"/>
+      <category render="true" symbol="2" value="habitation" label="Residential"/>
+    </categories>
+    <symbols>
+      <symbol type="marker" name="0" alpha="1">
+        <layer class="SimpleMarker">
+          <prop k="color" v="${hospital_color}"/>
+          <prop k="size" v="${hospital_size}"/>
+          <prop k="outline_color" v="${hospital_outline_color}"/>
+          <prop k="outline_width" v="0.5"/>
+        </layer>
+      </symbol>
+      <symbol type="marker" name="1" alpha="1">
+        <layer class="SimpleMarker">
+          <prop k="color" v="${school_color}"/>
+          <prop k="size" v="${school_size}"/>
+          <prop k="outline_color" v="${school_outline_color}"/>
+          <prop k="outline_width" v="0.5"/>
+        </layer>
+      </symbol>
+      <symbol type="marker" name="2" alpha="1">
+        <layer class="SimpleMarker">
+          <prop k="color" v="${residential_color}"/>
+          <prop k="size" v="${residential_size}"/>
+          <prop k="outline_color" v="${residential_outline_color}"/>
+          <prop k="outline_width" v="0.5"/>
+        </layer>
+      </symbol>
+    </symbols>
+  </renderer-v2>
+  <labeling type="simple">
+    <settings>
+      <text-style fontFamily="Arial" fontSize="8" textColor="0,0,0,255">
+        <text-buffer bufferDraw="1" bufferSize="1" bufferColor="255,255,255,255"/>
+      </text-style>
+      <placement placement="1" dist="2"/>
+      <rendering displayAll="0" obstacle="1"/>
+      <dd_properties>
+        <Option type="Map">
+          <Option type="QString" name="name" value=""/>
+          <Option name="properties"/>
+          <Option type="QString" name="type" value="collection"/>
+        </Option>
+      </dd_properties>
+    </settings>
+  </labeling>
+</qgis>
@@ -1,18 +1,23 @@
-import geopandas as gpd
+import numpy as np
+import pyogrio
 
-batiments = gpd.read_file("/Users/asmae/Downloads/projet/data/batiments.shp")
-infras = gpd.read_file("/Users/asmae/Downloads/projet/data/infrastructures.shp")
+BATIMENTS_SHP = "/Users/asmae/Downloads/projet/data/batiments.shp"
+INFRAS_SHP = "/Users/asmae/Downloads/projet/data/infrastructures.shp"
+
+# Layer metadata only: CRS and extent come from the header/.prj, no features are read
+batiments_info = pyogrio.read_info(BATIMENTS_SHP, force_total_bounds=True)
+infras_info = pyogrio.read_info(INFRAS_SHP, force_total_bounds=True)
 
 print("\n=== CRS CHECK ===")
-print("Buildings CRS:", batiments.crs)
-print("Infrastructures CRS:", infras.crs)
+print("Buildings CRS:", batiments_info["crs"])
+print("Infrastructures CRS:", infras_info["crs"])
 
 print("\nFirst building geometry sample:")
-print(batiments.geometry.iloc[0])
+print(pyogrio.read_dataframe(BATIMENTS_SHP, columns=[], max_features=1, use_arrow=True).geometry.iloc[0])
 
 print("\nFirst infrastructure geometry sample:")
-print(infras.geometry.iloc[0])
+print(pyogrio.read_dataframe(INFRAS_SHP, columns=[], max_features=1, use_arrow=True).geometry.iloc[0])
 
 print("\nBounding boxes:")
-print("Buildings extent:", batiments.total_bounds)
-print("Infra extent:", infras.total_bounds)
+print("Buildings extent:", np.asarray(batiments_info["total_bounds"]))
+print("Infra extent:", np.asarray(infras_info["total_bounds"]))
@@ -2,68 +2,30 @@
 Generate QGIS style files (.qml) for automatic styling of the solution layers
 """
 
-def create_buildings_style():
-    """Create QML style for buildings layer with color coding by priority"""
-    qml_content = """<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>
-<qgis version="3.28.0">
-  <renderer-v2 type="categorizedSymbol" attr="type" forceraster="0">
-    <categories>
-      <category render="true" symbol="0" value="hôpital" label="Hospital (Critical)"/>
-      <category render="true" symbol="1" value="école" label="School (High Priority)"/>
-      <category render="true" symbol="2" value="habitation" label="Residential"/>
-    </categories>
-    <symbols>
-      <symbol type="marker" name="0" alpha="1">
-        <layer class="SimpleMarker">
-          <prop k="color" v="255,0,0,255"/>
-          <prop k="size" v="5"/>
-          <prop k="outline_color" v="128,0,0,255"/>
-          <prop k="outline_width" v="0.5"/>
-        </layer>
-      </symbol>
-      <symbol type="marker" name="1" alpha="1">
-        <layer class="SimpleMarker">
-          <prop k="color" v="255,165,0,255"/>
-          <prop k="size" v="4"/>
-          <prop k="outline_color" v="128,82,0,255"/>
-          <prop k="outline_width" v="0.5"/>
-        </layer>
-      </symbol>
-      <symbol type="marker" name="2" alpha="1">
-        <layer class="SimpleMarker">
-          <prop k="color" v="0,128,255,255"/>
-          <prop k="size" v="3"/>
-          <prop k="outline_color" v="0,64,128,255"/>
-          <prop k="outline_width" v="0.5"/>
-        </layer>
-      </symbol>
-    </symbols>
-  </renderer-v2>
-  <labeling type="simple">
-    <settings>
-      <text-style fontFamily="Arial" fontSize="8" textColor="0,0,0,255">
-        <text-buffer bufferDraw="1" bufferSize="1" bufferColor="255,255,255,255"/>
-      </text-style>
-      <placement placement="1" dist="2"/>
-      <rendering displayAll="0" obstacle="1"/>
-      <dd_properties>
-        <Option type="Map">
-          <Option type="QString" name="name" value=""/>
-          <Option name="properties"/>
-          <Option type="QString" name="type" value="collection"/>
-        </Option>
-      </dd_properties>
-    </settings>
-  </labeling>
-</qgis>"""
-    
-    with open('optimal_solution_buildings_connected.qml', 'w') as f:
-        f.write(qml_content)
-    print("✓ Created buildings style file: optimal_solution_buildings_connected.qml")
+import hashlib
+import string
+from pathlib import Path
 
-def create_lines_style():
-    """Create QML style for connection lines with graduated colors by cost"""
-    qml_content = """<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>
+# Buildings QML template, read once at import; colors and sizes are filled in per call
+_BUILDINGS_TPL = string.Template(
+    Path(__file__).with_name('buildings.qml.tpl').read_text(encoding='utf-8').rstrip('\n')
+)
+
+# Default buildings palette (QGIS RGBA colors and marker sizes)
+BUILDINGS_STYLE = {
+    'hospital_color': '255,0,0,255',
+    'hospital_outline_color': '128,0,0,255',
+    'hospital_size': '5',
+    'school_color': '255,165,0,255',
+    'school_outline_color': '128,82,0,255',
+    'school_size': '4',
+    'residential_color': '0,128,255,255',
+    'residential_outline_color': '0,64,128,255',
+    'residential_size': '3',
+}
+
+# Connection lines QML document, encoded once at import
+_LINES_QML = """<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>
 <qgis version="3.28.0">
   <renderer-v2 type="categorizedSymbol" attr="infra_type" forceraster="0">
     <categories>
@@ -111,11 +73,38 @@ def create_lines_style():
       </dd_properties>
     </settings>
   </labeling>
-</qgis>"""
-    
-    with open('optimal_solution_connection_lines.qml', 'w') as f:
-        f.write(qml_content)
-    print("✓ Created connection lines style file: optimal_solution_connection_lines.qml")
+</qgis>""".encode('utf-8')
+
+
+def _write_if_changed(path, content):
+    """
+    Write content to path, skipping the write when the file already holds the
+    same bytes (keeps its mtime stable for downstream tools).
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    if path.exists() and hashlib.blake2b(path.read_bytes()).digest() == hashlib.blake2b(content).digest():
+        return False
+    path.write_bytes(content)
+    return True
+
+def create_buildings_style(output_path='optimal_solution_buildings_connected.qml', **style):
+    """
+    Create QML style for buildings layer with color coding by priority
+    Keyword arguments override BUILDINGS_STYLE entries, e.g. hospital_color='200,0,0,255'.
+    """
+    content = _BUILDINGS_TPL.substitute(BUILDINGS_STYLE, **style).encode('utf-8')
+    if _write_if_changed(output_path, content):
+        print(f"✓ Created buildings style file: {output_path}")
+    else:
+        print(f"✓ Buildings style file up to date: {output_path}")
+
+def create_lines_style():
+    """Create QML style for connection lines with graduated colors by cost"""
+    if _write_if_changed('optimal_solution_connection_lines.qml', _LINES_QML):
+        print("✓ Created connection lines style file: optimal_solution_connection_lines.qml")
+    else:
+        print("✓ Connection lines style file up to date: optimal_solution_connection_lines.qml")
 
 def main():
     """Generate all QGIS style files"""
@@ -0,0 +1,29 @@
+"""
+Column-wise field resolution shared by the optimizer scripts.
+"""
+
+import numpy as np
+
+
+def first_truthy(df, columns, default):
+    """
+    Column-wise version of `row.get(a) or row.get(b) or ... or default`: each
+    entry comes from the first listed column where it is truthy. Columns absent
+    from df (or None) are skipped; default is a scalar or an array aligned on
+    df's rows. As with `or`, NaN is truthy and is kept.
+    
+    Args:
+        df: DataFrame to read from
+        columns: Candidate column names, in order of preference
+        default: Value used where no column is truthy
+    
+    Returns:
+        np.ndarray: object array with one value per row
+    """
+    values = np.empty(len(df), dtype=object)
+    values[:] = default
+    for column in reversed([c for c in columns if c is not None and c in df.columns]):
+        column_values = df[column].to_numpy(dtype=object)
+        truthy = column_values.astype(bool)
+        values[truthy] = column_values[truthy]
+    return values
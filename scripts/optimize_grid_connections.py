@@ -5,22 +5,155 @@ calculates optimal connections, and generates shapefiles for QGIS.
 """
 
 import json
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point, LineString
-from Batiment import Batiment
-from Infrastructure import Infrastructure
+from numba import njit, prange
+import shapely
+from pyproj import Transformer
+from shapely import STRtree
+from shapely.geometry import Point
+from Batiment import BatimentTable
+from fields import first_truthy
+from Infrastructure import InfrastructureTable
+
+
+def _last_row_per_id(ids):
+    """
+    Row of the last occurrence of each id, in order of first occurrence
+    (what filling a dict keyed by id keeps).
+    """
+    _, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    last = np.zeros(first.size, dtype=np.int64)
+    np.maximum.at(last, inverse.reshape(-1), np.arange(len(ids)))
+    return last[np.argsort(first)]
+
+
+def _all_of_type(geoms, geom_type):
+    """True if every geometry is a non-empty geometry of the given type."""
+    return bool(np.all(shapely.get_type_id(geoms) == geom_type) and not np.any(shapely.is_empty(geoms)))
+
+
+def _to_crs(gdf, crs):
+    """
+    Reproject a GeoDataFrame. A layer of plain 2D points is transformed as one
+    coordinate array with pyproj instead of going through gdf.to_crs.
+    """
+    geoms = gdf.geometry.to_numpy()
+    if not _all_of_type(geoms, shapely.GeometryType.POINT) or shapely.has_z(geoms).any():
+        return gdf.to_crs(crs)
+
+    transformer = Transformer.from_crs(gdf.crs, crs, always_xy=True)
+    x, y = shapely.get_coordinates(geoms).T
+    x, y = transformer.transform(x, y)
+    points = gpd.GeoSeries(shapely.points(x, y), index=gdf.index, crs=crs)
+    return gdf.set_geometry(points.rename(gdf.geometry.name))
+
+
+@njit(parallel=True, cache=True)
+def _pair_distance_kernel(points_xy, coords, line_start, line_index):
+    """Distance from each point to the segments of its paired line"""
+    dist = np.empty(line_index.size)
+    for p in prange(line_index.size):
+        px = points_xy[p, 0]
+        py = points_xy[p, 1]
+        line = line_index[p]
+        best = np.inf
+        for c in range(line_start[line], line_start[line + 1] - 1):
+            wx = px - coords[c, 0]
+            wy = py - coords[c, 1]
+            vx = coords[c + 1, 0] - coords[c, 0]
+            vy = coords[c + 1, 1] - coords[c, 1]
+            len2 = vx * vx + vy * vy
+            t = 0.0
+            if len2 > 0.0:
+                t = min(max((wx * vx + wy * vy) / len2, 0.0), 1.0)
+            dx = wx - t * vx
+            dy = wy - t * vy
+            d = np.sqrt(dx * dx + dy * dy)
+            if d < best:
+                best = d
+        dist[p] = best
+    return dist
+
+
+def point_to_line_pair_distances(points_xy, lines, line_index):
+    """
+    Distance from each point to its paired line, computed with a compiled
+    point-to-segment loop instead of one GEOS call per pair.
+
+    Args:
+        points_xy (np.ndarray): (P, 2) point coordinates, one per pair
+        lines (np.ndarray): (I,) non-empty LineString geometries
+        line_index (np.ndarray): (P,) index into lines for each pair
+
+    Returns:
+        np.ndarray: (P,) distances
+    """
+    coords, coord_line = shapely.get_coordinates(lines, return_index=True)
+    # Coordinates of line i are coords[line_start[i]:line_start[i + 1]]
+    line_start = np.searchsorted(coord_line, np.arange(len(lines) + 1))
+    return _pair_distance_kernel(np.ascontiguousarray(points_xy, dtype=np.float64), coords,
+                                 line_start, np.asarray(line_index, dtype=np.int64))
+
+
+def greedy_select(cost, time, budget=None, max_time=None):
+    """
+    Walk candidates in order and keep each one that still fits the budget and
+    time limit (a candidate that does not fit is skipped, not a stop).
+
+    Runs as a few cumulative-sum passes instead of one Python step per
+    candidate: candidates that no longer fit are dropped, then the longest
+    prefix that fits is accepted, until no candidate is left.
+
+    Args:
+        cost (np.ndarray): Cost of each candidate, in scan order
+        time (np.ndarray): Time of each candidate, in scan order
+        budget (float): Maximum total cost (None for no limit)
+        max_time (float): Maximum total time (None for no limit)
+
+    Returns:
+        tuple: (selected, total_cost, total_time) with selected the accepted
+               positions in scan order
+    """
+    budget = np.inf if budget is None else budget
+    max_time = np.inf if max_time is None else max_time
+    remaining = np.arange(len(cost))
+    selected = []
+    spent_cost, spent_time = 0.0, 0.0
+
+    while remaining.size:
+        # Totals only grow, so a candidate that does not fit now never will
+        remaining = remaining[(spent_cost + cost[remaining] <= budget)
+                              & (spent_time + time[remaining] <= max_time)]
+        # Running totals, summed in the same order as a sequential scan
+        cum_cost = np.cumsum(np.r_[spent_cost, cost[remaining]])[1:]
+        cum_time = np.cumsum(np.r_[spent_time, time[remaining]])[1:]
+        fits = (cum_cost <= budget) & (cum_time <= max_time)
+        n_fit = remaining.size if fits.all() else int(np.argmin(fits))
+        if n_fit:
+            selected.append(remaining[:n_fit])
+            spent_cost, spent_time = cum_cost[n_fit - 1], cum_time[n_fit - 1]
+        remaining = remaining[n_fit + 1:]
+
+    selected = np.concatenate(selected) if selected else np.empty(0, dtype=np.int64)
+    return selected, float(spent_cost), float(spent_time)
 
 
 class GridOptimizer:
     """
     Main class for optimizing electrical grid connections.
+    Buildings and infrastructures are stored column-wise (BatimentTable,
+    InfrastructureTable); the plan refers to buildings by row index.
     """
 
     def __init__(self):
-        self.batiments = {}
-        self.infrastructures = {}
-        self.connection_plan = []
+        self.batiments = BatimentTable([], [], [])
+        self.infrastructures = InfrastructureTable([], [])
+        self.cost_pm = np.empty(0)  # float64 cost per meter of each line
+        self.time_pm = np.empty(0)  # float64 time per meter of each line
+        self.connection_plan = pd.DataFrame()
+        self.plan_indices = np.empty(0, dtype=np.int64)  # building rows, in plan order
         self.total_cost = 0.0
         self.total_time = 0.0
         self.buildings_connected = 0
@@ -40,37 +173,23 @@ class GridOptimizer:
         # ------------------------
         if batiments_shp:
             print(f"Reading buildings from shapefile: {batiments_shp}")
-            gdf_batiments = gpd.read_file(batiments_shp)
+            gdf_batiments = gpd.read_file(batiments_shp, engine="pyogrio", use_arrow=True)
             self.crs = gdf_batiments.crs  # remember CRS for exports
             
             if self.crs and self.crs.is_geographic:
                 print(f"⚠️  Buildings are in geographic CRS ({self.crs}), reprojecting to metric (EPSG:3857)...")
-                gdf_batiments = gdf_batiments.to_crs("EPSG:3857")
+                gdf_batiments = _to_crs(gdf_batiments, "EPSG:3857")
                 self.crs = gdf_batiments.crs
                 print(f"✓ Reprojected to {self.crs}")
 
-            for idx, row in gdf_batiments.iterrows():
-                bat_id = str(
-                    row.get('id_batiment')
-                    or row.get('ID_BATIMENT')
-                    or row.get('id')
-                    or idx
-                )
-                type_b = str(
-                    row.get('type_batiment')
-                    or row.get('TYPE_BATIMENT')
-                    or 'habitation'
-                )
-                nb_maisons = int(
-                    row.get('nb_maisons')
-                    or row.get('NB_MAISONS')
-                    or 1
-                )
-
-                b = Batiment(bat_id, type_b, nb_maisons)
-                b.geometry = row.geometry
-                b.calculate_priority()
-                self.batiments[bat_id] = b
+            ids = first_truthy(gdf_batiments, ('id_batiment', 'ID_BATIMENT', 'id'),
+                                gdf_batiments.index.to_numpy(dtype=object)).astype(str)
+            types = first_truthy(gdf_batiments, ('type_batiment', 'TYPE_BATIMENT'), 'habitation').astype(str)
+            nbs = first_truthy(gdf_batiments, ('nb_maisons', 'NB_MAISONS'), 1).astype(np.int64)
+            rows = _last_row_per_id(ids)
+
+            self.batiments = BatimentTable(ids[rows], types[rows], nbs[rows],
+                                           gdf_batiments.geometry.to_numpy()[rows])
 
             print(f"Loaded {len(self.batiments)} buildings from shapefile.")
         else:
@@ -81,7 +200,7 @@ class GridOptimizer:
         # ------------------------
         if infrastructures_shp:
             print(f"Reading infrastructures from shapefile: {infrastructures_shp}")
-            gdf_infra = gpd.read_file(infrastructures_shp)
+            gdf_infra = gpd.read_file(infrastructures_shp, engine="pyogrio", use_arrow=True)
 
             # If infra shapefile has a CRS and we don't, adopt it
             if self.crs is None:
@@ -91,23 +210,15 @@ class GridOptimizer:
                 print(f"Reprojecting infrastructures from {gdf_infra.crs} to {self.crs}")
                 gdf_infra = gdf_infra.to_crs(self.crs)
 
-            for idx, row in gdf_infra.iterrows():
-                infra_id = str(
-                    row.get('id_infra')
-                    or row.get('ID_INFRA')
-                    or row.get('id')
-                    or idx
-                )
-                type_i = str(
-                    row.get('type_infra')
-                    or row.get('TYPE_INFRA')
-                    or 'aérien'
-                )
-
-                infra = Infrastructure(infra_id, type_i)
-                infra.geometry = row.geometry
-                infra.calculate_length()
-                self.infrastructures[infra_id] = infra
+            ids = first_truthy(gdf_infra, ('id_infra', 'ID_INFRA', 'id'),
+                                gdf_infra.index.to_numpy(dtype=object)).astype(str)
+            types = first_truthy(gdf_infra, ('type_infra', 'TYPE_INFRA'), 'aérien').astype(str)
+            rows = _last_row_per_id(ids)
+
+            self.infrastructures = InfrastructureTable(ids[rows], types[rows],
+                                                       geometry=gdf_infra.geometry.to_numpy()[rows])
+            self.cost_pm = self.infrastructures.cost_per_meter.astype(np.float64)
+            self.time_pm = self.infrastructures.time_per_meter.astype(np.float64)
 
             print(f"Loaded {len(self.infrastructures)} infrastructure lines from shapefile.")
         else:
@@ -122,52 +233,91 @@ class GridOptimizer:
         print("\nCalculating connection costs...")
         print(f"Using CRS: {self.crs}")
         
-        distances = []
-
-        for idx, (bat_id, batiment) in enumerate(self.batiments.items()):
-            min_cost = float('inf')
-            best_infra = None
-            best_time = 0.0
-            min_distance = float('inf')
-
-            for infra_id, infra in self.infrastructures.items():
-                if infra.geometry is not None and batiment.geometry is not None:
-                    # distance from point to line
-                    distance = batiment.geometry.distance(infra.geometry)
-                    
-                    if distance < 1.0:  # Less than 1 meter (or 1 degree if still in geographic coords)
-                        distance = 10.0  # Set minimum 10 meter connection distance
-                    
-                    cost = distance * infra.cost_per_meter
-                    time = distance * infra.time_per_meter
-                else:
-                    # fallback estimate when geometry missing
-                    distance = 50.0  # meters
-                    cost = distance * infra.cost_per_meter
-                    time = distance * infra.time_per_meter
-
-                if cost < min_cost:
-                    min_cost = cost
-                    best_infra = infra_id
-                    best_time = time
-                    min_distance = distance
-
-            if best_infra is not None:
-                batiment.connection_cost = max(min_cost, self.min_connection_cost)
-                batiment.connection_time = best_time
-                batiment.connected_via = best_infra
-                distances.append(min_distance)
-
-            # Debug print for first few buildings
-            if idx < 5:
-                print(f"  {bat_id}: nearest infra={best_infra}, distance={min_distance:.2f}m, cost={batiment.connection_cost:.2f}€, time={best_time:.2f}h")
-
-        if distances:
+        bats, infras = self.batiments, self.infrastructures
+        if len(infras) == 0:
+            print("⚠️ No infrastructure lines to connect to.")
+            return
+
+        bat_geoms = bats.geometry
+        infra_geoms = infras.geometry
+        cost_pm, time_pm = self.cost_pm, self.time_pm
+
+        n_bat, n_infra = len(bats), len(infras)
+        bat_missing = shapely.is_missing(bat_geoms)
+        infra_missing = shapely.is_missing(infra_geoms)
+
+        # Candidate (building, line) pairs from one STRtree per cost rate. Within a
+        # rate the cheapest line is the nearest one, except that distances under 1 m
+        # are billed as 10 m, so every line within 10 m is a candidate too.
+        pair_bat, pair_infra = [], []
+        infra_usable = ~(infra_missing | shapely.is_empty(infra_geoms))
+        for rate in np.unique(cost_pm):
+            members = np.flatnonzero((cost_pm == rate) & infra_usable)
+            if members.size == 0:
+                continue
+            if rate == 0:
+                # Free lines cost nothing at any distance: the first one always wins
+                pair_bat.append(np.arange(n_bat))
+                pair_infra.append(np.full(n_bat, members[0]))
+                continue
+            tree = STRtree(infra_geoms[members])
+            for b, i in (tree.query_nearest(bat_geoms, all_matches=True),
+                         tree.query(bat_geoms, predicate='dwithin', distance=10.0)):
+                pair_bat.append(b)
+                pair_infra.append(members[i])
+        # fallback estimate when geometry missing: every such pair is a candidate
+        missing_bat = np.flatnonzero(bat_missing)
+        missing_infra = np.flatnonzero(infra_missing)
+        pair_bat += [np.repeat(missing_bat, n_infra), np.repeat(np.arange(n_bat), missing_infra.size)]
+        pair_infra += [np.tile(np.arange(n_infra), missing_bat.size), np.tile(missing_infra, n_bat)]
+        pair_bat = np.concatenate(pair_bat).astype(np.int64)
+        pair_infra = np.concatenate(pair_infra).astype(np.int64)
+
+        if (_all_of_type(bat_geoms, shapely.GeometryType.POINT)
+                and _all_of_type(infra_geoms, shapely.GeometryType.LINESTRING)):
+            # Fast path: plain point-to-segment arithmetic in NumPy
+            bat_xy = shapely.get_coordinates(bat_geoms)
+            dist = point_to_line_pair_distances(bat_xy[pair_bat], infra_geoms, pair_infra)
+        else:
+            dist = shapely.distance(bat_geoms[pair_bat], infra_geoms[pair_infra])
+        # Less than 1 meter (or 1 degree if still in geographic coords): set minimum 10 meter connection distance
+        dist = np.where(dist < 1.0, 10.0, dist)
+        dist[bat_missing[pair_bat] | infra_missing[pair_infra]] = 50.0  # meters
+
+        cost = dist * cost_pm[pair_infra]
+        cost = np.where(np.isnan(cost), np.inf, cost)  # never pick an undefined distance
+
+        # Cheapest pair per building (lowest line index on ties, like a linear scan)
+        order = np.lexsort((pair_infra, cost, pair_bat))
+        first = np.r_[True, pair_bat[order][1:] != pair_bat[order][:-1]]
+        chosen = order[first]
+
+        best = np.zeros(n_bat, dtype=np.int64)
+        min_costs = np.full(n_bat, np.inf)
+        min_distances = np.full(n_bat, np.inf)
+        best[pair_bat[chosen]] = pair_infra[chosen]
+        min_costs[pair_bat[chosen]] = cost[chosen]
+        min_distances[pair_bat[chosen]] = dist[chosen]
+        found = min_costs < np.inf
+        min_distances[~found] = np.inf
+        best_times = np.where(found, min_distances * time_pm[best], 0.0)
+
+        bats.cost[found] = np.maximum(min_costs[found], self.min_connection_cost)
+        bats.time[found] = best_times[found]
+        bats.connected_via[found] = best[found]
+
+        # Debug print for first few buildings
+        for idx in range(min(5, n_bat)):
+            best_infra = infras.id[best[idx]] if found[idx] else None
+            print(f"  {bats.id[idx]}: nearest infra={best_infra}, distance={min_distances[idx]:.2f}m, cost={bats.cost[idx]:.2f}€, time={best_times[idx]:.2f}h")
+
+        distances = min_distances[found]
+        if distances.size:
             print(f"\nDistance Statistics:")
-            print(f"  Min distance: {min(distances):.2f}m")
-            print(f"  Max distance: {max(distances):.2f}m")
-            print(f"  Avg distance: {sum(distances)/len(distances):.2f}m")
-            print(f"  Buildings with distance < 1m: {sum(1 for d in distances if d < 1.0)}")
+            print(f"  Min distance: {distances.min():.2f}m")
+            print(f"  Max distance: {distances.max():.2f}m")
+            print(f"  Avg distance: {distances.mean():.2f}m")
+            print(f"  Buildings with distance < 1m: {np.count_nonzero(distances < 1.0)}")
 
     def optimize_connections(self, budget=None, max_time=None):
         """
@@ -176,54 +326,52 @@ class GridOptimizer:
         """
         print("\nOptimizing connections...")
 
-        building_scores = []
-        for bat_id, b in self.batiments.items():
-            if getattr(b, "connection_cost", None):
-                efficiency = b.nb_maisons / b.connection_cost
-                score = b.priority_score * efficiency
-                building_scores.append((score, bat_id, b))
-
-        building_scores.sort(key=lambda x: x[0], reverse=True)
+        bats, infras = self.batiments, self.infrastructures
+        candidates = np.flatnonzero(bats.cost != 0)
+        efficiency = bats.get_efficiency_scores()
+        scores = bats.priority_score[candidates] * efficiency[candidates]
+        order = np.argsort(-scores, kind='stable')
+        candidates, scores = candidates[order], scores[order]
         
         print(f"\nTop 5 connection candidates:")
-        for i, (score, bat_id, b) in enumerate(building_scores[:5]):
-            print(f"  {i+1}. Building {bat_id}: score={score:.4f}, cost={b.connection_cost:.2f}€, houses={b.nb_maisons}, type={b.type_batiment}")
-
-        cumulative_cost = 0.0
-        cumulative_time = 0.0
-
-        for score, bat_id, b in building_scores:
-            new_cost = cumulative_cost + b.connection_cost
-            new_time = cumulative_time + b.connection_time
-
-            if budget is not None and new_cost > budget:
-                continue
-            if max_time is not None and new_time > max_time:
-                continue
-
-            b.connected = True
-            infra = self.infrastructures[b.connected_via]
-            infra.add_building(bat_id)
-
-            self.connection_plan.append({
-                'building_id': bat_id,
-                'building_type': b.type_batiment,
-                'nb_houses': b.nb_maisons,
-                'infrastructure_id': b.connected_via,
-                'infrastructure_type': infra.type_infra,
-                'cost': b.connection_cost,
-                'time': b.connection_time,
-                'priority_score': b.priority_score,
-                'efficiency': b.get_efficiency_score()
-            })
-
-            cumulative_cost = new_cost
-            cumulative_time = new_time
-            self.buildings_connected += 1
-            self.houses_connected += b.nb_maisons
-
-        self.total_cost = cumulative_cost
-        self.total_time = cumulative_time
+        for i, (score, b) in enumerate(zip(scores[:5], candidates[:5])):
+            print(f"  {i+1}. Building {bats.id[b]}: score={score:.4f}, cost={bats.cost[b]:.2f}€, houses={bats.nb[b]}, type={bats.type_batiment[b]}")
+
+        cost, time = bats.cost[candidates], bats.time[candidates]
+        selected, self.total_cost, self.total_time = greedy_select(cost, time, budget, max_time)
+
+        # The ratio greedy alone can do arbitrarily badly when one valuable but
+        # expensive building is skipped; keep the best single building instead
+        # if it is worth more on its own (Krause & Guestrin)
+        value = bats.priority_score[candidates].astype(np.int64) * bats.nb[candidates]
+        fits = ((cost <= (np.inf if budget is None else budget))
+                & (time <= (np.inf if max_time is None else max_time)))
+        if fits.any():
+            best = np.flatnonzero(fits)[np.argmax(value[fits])]
+            if value[best] > value[selected].sum():
+                print(f"\nBuilding {bats.id[candidates[best]]} alone is worth more than the greedy plan, connecting it instead")
+                selected = np.array([best])
+                self.total_cost, self.total_time = float(cost[best]), float(time[best])
+
+        plan = candidates[selected]
+        via = bats.connected_via[plan]
+
+        self.plan_indices = plan
+        self.connection_plan = pd.DataFrame({
+            'building_id': bats.id[plan],
+            'building_type': bats.type_batiment[plan],
+            'nb_houses': bats.nb[plan],
+            'infrastructure_id': infras.id[via],
+            'infrastructure_type': infras.type_infra[via],
+            'cost': bats.cost[plan],
+            'time': bats.time[plan],
+            'priority_score': bats.priority_score[plan],
+            'efficiency': efficiency[plan]
+        })
+        bats.connected[plan] = True
+        infras.add_buildings(via)
+        self.buildings_connected = plan.size
+        self.houses_connected = int(bats.nb[plan].sum())
 
         print("\nOptimization complete!")
         print(f"Buildings to connect: {self.buildings_connected}/{len(self.batiments)}")
@@ -240,18 +388,13 @@ class GridOptimizer:
         print("CONNECTION PLAN STATISTICS")
         print("=" * 60)
 
-        # Building type breakdown
-        type_stats = {}
-        for item in self.connection_plan:
-            btype = item['building_type']
-            type_stats.setdefault(btype, {'count': 0, 'houses': 0, 'cost': 0.0})
-            type_stats[btype]['count'] += 1
-            type_stats[btype]['houses'] += item['nb_houses']
-            type_stats[btype]['cost'] += item['cost']
-
+        # Building type breakdown, in order of first appearance in the plan
         print("\nBy Building Type:")
-        for btype, stats in type_stats.items():
-            print(f"  {btype}: {stats['count']} buildings, {stats['houses']} houses, {stats['cost']:,.2f} €")
+        if not self.connection_plan.empty:
+            type_stats = self.connection_plan.groupby('building_type', sort=False, dropna=False).agg(
+                buildings=('building_type', 'size'), houses=('nb_houses', 'sum'), cost=('cost', 'sum'))
+            for stats in type_stats.itertuples():
+                print(f"  {stats.Index}: {stats.buildings} buildings, {stats.houses} houses, {stats.cost:,.2f} €")
 
         if self.buildings_connected:
             print(f"\nAverage cost/building: {self.total_cost / self.buildings_connected:,.2f} €")
@@ -264,32 +407,30 @@ class GridOptimizer:
         """
         print(f"\nExporting buildings to shapefile: {output_path}")
 
-        if not self.connection_plan:
+        if self.connection_plan.empty:
             print("⚠️ No buildings were connected — skipping shapefile export.")
             return
 
-        features = []
-        for rank, item in enumerate(self.connection_plan, 1):
-            b = self.batiments[item['building_id']]
-            geom = b.geometry if b.geometry is not None else Point(0, 0)
-
-            features.append({
-                'geometry': geom,
-                'id': item['building_id'],
-                'type': item['building_type'],
-                'nb_maisons': item['nb_houses'],
-                'infra_id': item['infrastructure_id'],
-                'infra_type': item['infrastructure_type'],
-                'cost': round(item['cost'], 2),
-                'time_h': round(item['time'], 2),
-                'priority': round(item['priority_score'], 2),
-                'efficiency': round(item['efficiency'], 6),
-                'rank': rank,
-                'cost_house': round(item['cost'] / max(item['nb_houses'], 1), 2)
-            })
-
-        gdf = gpd.GeoDataFrame(features, geometry=[f["geometry"] for f in features], crs=self.crs or "EPSG:4326")
-        gdf.to_file(output_path)
+        plan = self.connection_plan
+        geoms = self.batiments.geometry[self.plan_indices].copy()
+        geoms[shapely.is_missing(geoms)] = Point(0, 0)
+        nb = plan['nb_houses'].to_numpy(np.int64)
+        cost = plan['cost'].to_numpy()
+
+        gdf = gpd.GeoDataFrame({
+            'id': plan['building_id'].to_numpy(),
+            'type': plan['building_type'].to_numpy(),
+            'nb_maisons': nb,
+            'infra_id': plan['infrastructure_id'].to_numpy(),
+            'infra_type': plan['infrastructure_type'].to_numpy(),
+            'cost': np.round(cost, 2),
+            'time_h': np.round(plan['time'].to_numpy(), 2),
+            'priority': plan['priority_score'].to_numpy(np.int64),
+            'efficiency': np.round(plan['efficiency'].to_numpy(), 6),
+            'rank': np.arange(1, len(plan) + 1),
+            'cost_house': np.round(cost / np.maximum(nb, 1), 2)
+        }, geometry=geoms, crs=self.crs or "EPSG:4326")
+        gdf.to_file(output_path, engine="pyogrio")
         print("Shapefile exported successfully.")
 
     def export_connection_lines(self, output_path):
@@ -298,37 +439,33 @@ class GridOptimizer:
         """
         print(f"\nExporting connection lines to shapefile: {output_path}")
 
-        features = []
-        for rank, item in enumerate(self.connection_plan, 1):
-            b = self.batiments[item['building_id']]
-            infra = self.infrastructures[item['infrastructure_id']]
-
-            if b.geometry is not None and infra.geometry is not None:
-                nearest_point = infra.geometry.interpolate(
-                    infra.geometry.project(b.geometry)
-                )
-                line_geom = LineString([b.geometry, nearest_point])
-
-                features.append({
-                    'geometry': line_geom,
-                    'bat_id': item['building_id'],
-                    'bat_type': item['building_type'],
-                    'infra_id': item['infrastructure_id'],
-                    'infra_type': item['infrastructure_type'],
-                    'cost': round(item['cost'], 2),
-                    'time_h': round(item['time'], 2),
-                    'distance_m': round(line_geom.length, 2),
-                    'rank': rank,
-                    'nb_maisons': item['nb_houses'],
-                    'shared': 1 if getattr(infra, "shared", False) else 0
-                })
-
-        if not features:
+        bats, infras = self.batiments, self.infrastructures
+        plan = self.plan_indices
+        via = bats.connected_via[plan]
+        bat_geoms = bats.geometry[plan]
+        kept = np.flatnonzero(~(shapely.is_missing(bat_geoms) | shapely.is_missing(infras.geometry[via])))
+
+        if kept.size == 0:
             print("⚠️ No connection lines with valid geometries to export.")
             return
 
-        gdf = gpd.GeoDataFrame(features, geometry=[f["geometry"] for f in features], crs=self.crs or "EPSG:4326")
-        gdf.to_file(output_path)
+        line_geoms = shapely.shortest_line(bat_geoms[kept], infras.geometry[via[kept]])
+        lengths = shapely.length(line_geoms)
+
+        items = self.connection_plan.iloc[kept]
+        gdf = gpd.GeoDataFrame({
+            'bat_id': items['building_id'].to_numpy(),
+            'bat_type': items['building_type'].to_numpy(),
+            'infra_id': items['infrastructure_id'].to_numpy(),
+            'infra_type': items['infrastructure_type'].to_numpy(),
+            'cost': np.round(items['cost'].to_numpy(), 2),
+            'time_h': np.round(items['time'].to_numpy(), 2),
+            'distance_m': np.round(lengths, 2),
+            'rank': kept + 1,
+            'nb_maisons': items['nb_houses'].to_numpy(np.int64),
+            'shared': infras.shared[via[kept]].astype(np.int64)
+        }, geometry=line_geoms, crs=self.crs or "EPSG:4326")
+        gdf.to_file(output_path, engine="pyogrio")
         print("Connection lines exported successfully.")
 
 
@@ -354,7 +491,7 @@ def main():
     optimizer.export_connection_lines('optimal_solution_connection_lines.shp')
 
     # CSV + JSON summaries
-    pd.DataFrame(optimizer.connection_plan).to_csv('optimal_solution_summary.csv', index=False)
+    optimizer.connection_plan.to_csv('optimal_solution_summary.csv', index=False, lineterminator='\n')
     stats = {
         'total_buildings_connected': optimizer.buildings_connected,
         'total_buildings': len(optimizer.batiments),
@@ -5,9 +5,11 @@ Automatically detects hospital buildings and generates a Gantt chart.
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import json
 import matplotlib.pyplot as plt
+from fields import first_truthy
 
 
 class WorkerScheduler:
@@ -29,6 +31,8 @@ class PhasedGridOptimizer:
     SAFETY_MARGIN = 0.2
     MAX_HOSPITAL_TIME = HOSPITAL_AUTONOMY / (1 + SAFETY_MARGIN)
     PHASES = {1: 0.4, 2: 0.2, 3: 0.2, 4: 0.2}
+    # Priority weight per building type (other types weigh 1)
+    WEIGHTS = {"hôpital": 100, "hopital": 100, "hospital": 100, "école": 50, "ecole": 50, "habitation": 10}
 
     def __init__(self):
         self.batiments = None
@@ -38,8 +42,8 @@ class PhasedGridOptimizer:
 
     def load_data(self, batiments_path, infras_path):
         print("Loading shapefiles...")
-        self.batiments = gpd.read_file(batiments_path)
-        self.infras = gpd.read_file(infras_path)
+        self.batiments = gpd.read_file(batiments_path, engine="pyogrio", use_arrow=True)
+        self.infras = gpd.read_file(infras_path, engine="pyogrio", use_arrow=True)
         print(f"Loaded {len(self.batiments)} buildings, {len(self.infras)} infrastructures.\n")
 
     def get_specs(self, infra_type):
@@ -47,62 +51,68 @@ class PhasedGridOptimizer:
 
     def calc_costs(self, avg_distance=50):
         print("Calculating connection costs...")
-        data = []
         type_col = next((c for c in self.batiments.columns if "type" in c.lower()), None)
         house_col = next((c for c in self.batiments.columns if "maison" in c.lower() or "house" in c.lower()), None)
 
-        for idx, b in self.batiments.iterrows():
-            b_type = str(b.get(type_col) or "habitation").strip().lower()
-            nb = int(b.get(house_col) or 1)
-            best_cost, best_type = float("inf"), None
-
-            for _, i in self.infras.iterrows():
-                i_type = str(i.get("type_infra") or i.get("TYPE_INFRA") or "aérien").strip().lower()
-                spec = self.get_specs(i_type)
-                cost = avg_distance * spec["cost_m"] + avg_distance * spec["time_m"] * 37.5
-                if cost < best_cost:
-                    best_cost, best_type = cost, i_type
-
-            data.append({
-                "id": b.get("id_batiment") or idx,
-                "type": b_type,
-                "nb_maisons": nb,
-                "infra_type": best_type,
-                "total_cost": best_cost,
-                "priority": self._priority(b_type, nb)
-            })
-
-        df = pd.DataFrame(data)
+        # The cost only depends on the infrastructure type, not on the building:
+        # find the cheapest type once (first one seen wins ties)
+        best_cost, best_type = float("inf"), None
+        for i_type in pd.unique(self._infra_types()):
+            spec = self.get_specs(i_type)
+            cost = avg_distance * spec["cost_m"] + avg_distance * spec["time_m"] * 37.5
+            if cost < best_cost:
+                best_cost, best_type = cost, i_type
+
+        b = self.batiments
+        b_types = pd.Series(first_truthy(b, [type_col], "habitation").astype(str),
+                            index=b.index).str.strip().str.lower()
+        nb = first_truthy(b, [house_col], 1).astype(np.int64)
+        ids = first_truthy(b, ["id_batiment"], b.index.to_numpy(dtype=object))
+
+        df = pd.DataFrame({
+            "id": ids,
+            "type": b_types.to_numpy(),
+            "nb_maisons": nb,
+            "infra_type": best_type,
+            "total_cost": best_cost,
+            "priority": (b_types.map(self.WEIGHTS).fillna(1).astype(int) * nb).to_numpy()
+        })
         df.sort_values("priority", ascending=False, inplace=True)
         self.results = df
         print("Costs calculated.\n")
 
-    def _priority(self, b_type, nb):
-        weights = {"hôpital": 100, "hopital": 100, "hospital": 100, "école": 50, "ecole": 50, "habitation": 10}
-        return weights.get(b_type, 1) * nb
+    def _infra_types(self):
+        """Normalized infrastructure type of every line."""
+        types = first_truthy(self.infras, ["type_infra", "TYPE_INFRA"], "aérien")
+        return pd.Series(types.astype(str)).str.strip().str.lower()
 
     def optimize_phases(self):
         print("Assigning buildings to phases...\n")
-        hospital_mask = self.results["type"].apply(lambda t: any(k in t for k in ["hôpital", "hopital", "hospital"]))
-        hospital = self.results[hospital_mask]
-        others = self.results[~hospital_mask]
-        total_cost = others["total_cost"].sum()
-
-        if not hospital.empty:
-            print(f"→ Phase 0: {len(hospital)} hospital(s) connected first.")
-            self.results.loc[hospital.index, "phase"] = 0
+        hospital_mask = self.results["type"].str.contains("hôpital|hopital|hospital").to_numpy()
+        hospital_rows = self.results.index[hospital_mask]
+        other_rows = self.results.index[~hospital_mask]
+        costs = self.results["total_cost"].to_numpy()[~hospital_mask]
+        total_cost = costs.sum()
+
+        if hospital_rows.size:
+            print(f"→ Phase 0: {hospital_rows.size} hospital(s) connected first.")
         else:
             print("⚠️ No hospital found (check shapefile type labels).")
 
-        others = others.copy()
-        others["phase"] = None
+        # Each phase takes the next buildings in priority order while their
+        # running cost (restarted at every phase) stays within its budget
+        counts = []
+        start = 0
         for phase, pct in self.PHASES.items():
             limit = total_cost * pct
-            subset = others[others["phase"].isna()]
-            chosen = subset[subset["total_cost"].cumsum() <= limit]
-            self.results.loc[chosen.index, "phase"] = phase
-            others = others.drop(chosen.index)
-            print(f"→ Phase {phase}: {len(chosen)} buildings ({pct*100:.0f}% cost)")
+            n_chosen = int(np.searchsorted(np.cumsum(costs[start:]), limit, side="right"))
+            counts.append(n_chosen)
+            start += n_chosen
+            print(f"→ Phase {phase}: {n_chosen} buildings ({pct*100:.0f}% cost)")
+
+        rows = hospital_rows.append(other_rows[:start])
+        phases = np.repeat([0, *self.PHASES], [hospital_rows.size, *counts])
+        self.results.loc[rows, "phase"] = phases
         print("\nPhases assigned.\n")
 
     def summarize(self):